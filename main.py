@@ -6,19 +6,24 @@ A cross-platform app for taking daily portraits and creating timelapses
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GdkPixbuf, GLib
+from gi.repository import Gtk, Gdk, GLib
+import cairo
 import cv2
 import os
 import json
 from datetime import datetime
 from pathlib import Path
 import subprocess
+import tempfile
 import threading
 import platform
 import argparse
+import errno
 import sys
 import queue
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Debug mode flag
 DEBUG = False
@@ -41,6 +46,100 @@ else:  # Linux
 os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
 debug_print(f"Config file location: {CONFIG_FILE}")
 
+# Minimum seconds between preview redraws (~30fps cap)
+PREVIEW_FRAME_INTERVAL = 0.033
+
+# A sampled pixel counts as changed if any channel differs by more than this (0-255);
+# smaller differences are treated as sensor noise
+PIXEL_CHANGE_THRESHOLD = 12
+
+# A frame counts as changed once this many sampled pixels changed, so any real
+# local change (e.g. a smile) is published immediately
+FRAME_CHANGE_PIXELS = 8
+
+# Backstop: publish a frame at least this often (seconds) even if it looks unchanged
+FRAME_MAX_AGE = 0.3
+
+# H.264 encoders: (args before -i, args after -i)
+H264_ENCODERS = {
+    'h264_videotoolbox': ([], ['-pix_fmt', 'yuv420p', '-c:v', 'h264_videotoolbox', '-q:v', '65']),
+    'h264_nvenc': ([], ['-pix_fmt', 'yuv420p', '-c:v', 'h264_nvenc', '-preset', 'p4']),
+    'h264_qsv': ([], ['-pix_fmt', 'nv12', '-c:v', 'h264_qsv']),
+    'h264_vaapi': (['-vaapi_device', '/dev/dri/renderD128'],
+                   ['-vf', 'format=nv12,hwupload', '-c:v', 'h264_vaapi']),
+    'libx264': ([], ['-pix_fmt', 'yuv420p', '-c:v', 'libx264', '-preset', 'medium']),
+}
+
+# Hardware encoders to try per OS, in order; libx264 is the fallback
+HW_ENCODER_PREFERENCE = {
+    'Darwin': ['h264_videotoolbox'],
+    'Windows': ['h264_nvenc', 'h264_qsv'],
+    'Linux': ['h264_vaapi', 'h264_nvenc'],
+}
+
+def detect_h264_encoder(ffmpeg_cmd):
+    """Pick the first hardware H.264 encoder that works, falling back to libx264"""
+    try:
+        result = subprocess.run([ffmpeg_cmd, '-hide_banner', '-encoders'],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                timeout=5)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return 'libx264'
+    available = result.stdout.decode(errors='replace').split()
+    
+    for name in HW_ENCODER_PREFERENCE.get(SYSTEM, []):
+        if name not in available:
+            continue
+        # Encoders are listed if compiled in, even without the hardware, so
+        # confirm with a one-frame test encode
+        pre_input, output = H264_ENCODERS[name]
+        cmd = [ffmpeg_cmd, '-hide_banner', '-loglevel', 'error', *pre_input,
+               '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+               *output, '-frames:v', '1', '-f', 'null', '-']
+        try:
+            if subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              timeout=10).returncode == 0:
+                debug_print(f"Using hardware encoder: {name}")
+                return name
+        except subprocess.TimeoutExpired:
+            pass
+        debug_print(f"Encoder {name} listed but not usable")
+    return 'libx264'
+
+def load_frame(path, size):
+    """Read an image as BGR letterboxed to size (width, height), or None if unreadable"""
+    frame = cv2.imread(path)
+    if frame is None:
+        return None
+    h, w = frame.shape[:2]
+    if (w, h) == size:
+        return frame
+    
+    # Fit inside size keeping the aspect ratio, then pad with black
+    scale = min(size[0] / w, size[1] / h)
+    fit_w = min(size[0], max(1, round(w * scale)))
+    fit_h = min(size[1], max(1, round(h * scale)))
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    frame = cv2.resize(frame, (fit_w, fit_h), interpolation=interpolation)
+    left = (size[0] - fit_w) // 2
+    top = (size[1] - fit_h) // 2
+    return cv2.copyMakeBorder(frame, top, size[1] - fit_h - top,
+                              left, size[0] - fit_w - left,
+                              cv2.BORDER_CONSTANT, value=(0, 0, 0))
+
+def load_frames(paths, size, prefetch=16):
+    """Yield load_frame() results in order, decoding up to prefetch photos ahead
+    on a thread pool (OpenCV releases the GIL while decoding)"""
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append(pool.submit(load_frame, path, size))
+            if len(pending) >= prefetch:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
 class Config:
     def __init__(self):
         if SYSTEM == 'Windows':
@@ -63,6 +162,9 @@ class Config:
             'guide_height': 0.4
         }
         self.load()
+        self._photos_dir = self.data['photos_directory']
+        self.version = 0  # Bumped on every set() so views can cache values
+        self.encoder = None  # Detected H.264 encoder, not persisted
         self._save_pending = False
         self._save_timer = None
     
@@ -81,14 +183,19 @@ class Config:
     def _do_save(self):
         """Actually perform the save operation"""
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(self.data, f, indent=2)
-            self._save_pending = False
-            self._save_timer = None
-            return False  # Don't repeat
+            # Write to a temp file and swap it in so a crash can't leave a torn config
+            tmp_file = CONFIG_FILE + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(self.data, f, separators=(',', ':'))
+            os.replace(tmp_file, CONFIG_FILE)
         except Exception as e:
             print(f"Error saving config: {e}")
-            return False
+        finally:
+            # The timer is gone once we return False, so always clear its state;
+            # otherwise a failed save would block every later save
+            self._save_pending = False
+            self._save_timer = None
+        return False  # Don't repeat
     
     def save(self):
         """Defer save to avoid blocking on every config change"""
@@ -103,40 +210,99 @@ class Config:
     def get(self, key):
         return self.data.get(key)
     
+    @property
+    def photos_directory(self):
+        return self._photos_dir
+    
     def set(self, key, value):
         self.data[key] = value
+        if key == 'photos_directory':
+            self._photos_dir = value
+        self.version += 1
         self.save()
 
 class CameraThread(threading.Thread):
-    def __init__(self):
+    def __init__(self, on_frame=None):
         super().__init__(daemon=True)
+        self.on_frame = on_frame  # Called on the GLib main loop when a frame is ready
         self.camera = None
         self.running = False
-        self.frame_queue = queue.Queue(maxsize=2)  # Limit queue size
+        self._latest = None  # Single slot, newest frame wins
+        self._latest_full = None  # Unscaled BGR frame for captures
+        self.target_size = None  # (width, height) of the preview area
         self.lock = threading.Lock()
         
     def run(self):
         debug_print("Camera thread starting...")
         try:
-            self.camera = cv2.VideoCapture(0)
+            backend = {
+                'Windows': cv2.CAP_DSHOW,
+                'Linux': cv2.CAP_V4L2,
+                'Darwin': cv2.CAP_AVFOUNDATION
+            }.get(SYSTEM, cv2.CAP_ANY)
+            self.camera = cv2.VideoCapture(0, backend)
             if not self.camera.isOpened():
                 debug_print("ERROR: Failed to open camera!")
                 return
             
+            # MJPG keeps USB bandwidth down; a 1-frame buffer avoids stale frames
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
             debug_print("Camera opened successfully in thread")
             self.running = True
+            backoff = 0
+            last_sample = None
+            last_target = None
+            last_publish = 0.0
             
             while self.running:
                 ret, frame = self.camera.read()
                 if ret:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    backoff = 0
+                    target = self.target_size
                     
-                    try:
-                        self.frame_queue.put_nowait(frame_rgb)
-                    except queue.Full:
-                        pass  # Drop frame if queue is full
+                    # Skip static scenes: compare a sparse sample (every 16th row and
+                    # column) with the last published frame. Captures still get it.
+                    now = time.monotonic()
+                    sample = frame[::16, ::16].copy()
+                    unchanged = (last_sample is not None and target == last_target
+                                 and now - last_publish < FRAME_MAX_AGE
+                                 and sample.shape == last_sample.shape)
+                    if unchanged:
+                        # Count sampled pixels with an above-noise change in any channel
+                        diff = cv2.absdiff(sample, last_sample)
+                        changed = (diff > PIXEL_CHANGE_THRESHOLD).any(axis=2).sum()
+                        unchanged = changed < FRAME_CHANGE_PIXELS
+                    if unchanged:
+                        with self.lock:
+                            self._latest_full = frame
+                        continue
+                    last_sample, last_target, last_publish = sample, target, now
+                    
+                    preview = frame
+                    if target:
+                        # Shrink to the preview area once here instead of on every draw
+                        h, w = frame.shape[:2]
+                        scale = min(target[0] / w, target[1] / h)
+                        if scale < 1:
+                            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+                            preview = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                    
+                    # BGRA matches Cairo's FORMAT_RGB24 layout on little-endian hosts
+                    frame_bgra = cv2.cvtColor(preview, cv2.COLOR_BGR2BGRA)
+                    with self.lock:
+                        self._latest = frame_bgra  # Overwrites any unread frame
+                        self._latest_full = frame
+                    if self.on_frame:
+                        GLib.idle_add(self.on_frame, priority=GLib.PRIORITY_DEFAULT_IDLE)
                 else:
-                    time.sleep(0.01) 
+                    # read() already blocks on the driver; only back off on failures
+                    # (e.g. camera unplugged) so we don't spin
+                    backoff = min(0.2, backoff * 2 if backoff else 0.01)
+                    time.sleep(backoff)
                     
         except Exception as e:
             debug_print(f"Camera thread error: {e}")
@@ -146,15 +312,15 @@ class CameraThread(threading.Thread):
             debug_print("Camera thread stopped")
     
     def get_frame(self):
-        """Get the latest frame (non-blocking)"""
-        try:
-            # Get most recent frame, discard older ones
-            frame = None
-            while not self.frame_queue.empty():
-                frame = self.frame_queue.get_nowait()
-            return frame
-        except queue.Empty:
-            return None
+        """Get the latest frame (non-blocking), or None if nothing new arrived"""
+        with self.lock:
+            frame, self._latest = self._latest, None
+        return frame
+    
+    def get_full_frame(self):
+        """Get the most recent full-resolution BGR frame"""
+        with self.lock:
+            return self._latest_full
     
     def stop(self):
         self.running = False
@@ -167,10 +333,16 @@ class CameraView(Gtk.Box):
         self.on_photo_taken_callback = on_photo_taken
         self.camera_thread = None
         self.captured_frame = None
+        self.preview_frame = None
         self.preview_mode = False
         self.current_frame = None
-        self.cached_pixbuf = None
-        self.last_frame_size = None
+        self._target_size = (640, 480)
+        self._redraw_timer = None
+        self._last_redraw = 0.0
+        self._cfg_ver = -1
+        self._cfg = None  # (guide_enabled, guide_x, guide_y, guide_width, guide_height)
+        self._guide_path = None
+        self._guide_path_key = None  # (config version, width, height)
         
         debug_print("Creating drawing area for camera feed")
         
@@ -178,6 +350,7 @@ class CameraView(Gtk.Box):
         self.drawing_area = Gtk.DrawingArea()
         self.drawing_area.set_size_request(640, 480)
         self.drawing_area.connect('draw', self.on_draw)
+        self.drawing_area.connect('size-allocate', self.on_size_allocate)
         self.pack_start(self.drawing_area, True, True, 0)
         
         # Guide controls
@@ -223,16 +396,18 @@ class CameraView(Gtk.Box):
         self.drawing_area.connect('button-release-event', self.on_button_release)
         
         self.dragging = False
+        self._pending_motion = None
+        self._motion_timer = None
         
         debug_print("CameraView initialization complete")
     
     def start_camera(self):
         if not self.camera_thread:
             debug_print("Starting camera thread...")
-            self.camera_thread = CameraThread()
+            # Redraws are driven by the camera thread, not a polling timer
+            self.camera_thread = CameraThread(on_frame=self._on_frame_ready)
+            self.camera_thread.target_size = self._target_size
             self.camera_thread.start()
-            # Slower update rate - 60fps is overkill for preview
-            GLib.timeout_add(50, self.update_frame)  # 20fps is plenty
     
     def stop_camera(self):
         if self.camera_thread:
@@ -240,21 +415,46 @@ class CameraView(Gtk.Box):
             self.camera_thread.stop()
             self.camera_thread = None
     
-    def update_frame(self):
-        if self.camera_thread and self.camera_thread.running and not self.preview_mode:
+    def _on_frame_ready(self):
+        """Schedule a redraw for a new frame, at most once per PREVIEW_FRAME_INTERVAL"""
+        if self._redraw_timer is None:
+            delay = self._last_redraw + PREVIEW_FRAME_INTERVAL - time.monotonic()
+            if delay > 0:
+                self._redraw_timer = GLib.timeout_add(int(delay * 1000) + 1, self._pull_frame)
+            else:
+                self._pull_frame()
+        return False  # Don't repeat
+    
+    def _pull_frame(self):
+        self._redraw_timer = None
+        self._last_redraw = time.monotonic()
+        if self.camera_thread and not self.preview_mode:
             frame = self.camera_thread.get_frame()
             if frame is not None:
                 self.current_frame = frame
                 self.drawing_area.queue_draw()
-            return True
-        return self.camera_thread and self.camera_thread.running
+        return False  # Don't repeat
+    
+    def on_size_allocate(self, widget, allocation):
+        self._target_size = (allocation.width, allocation.height)
+        if self.camera_thread:
+            self.camera_thread.target_size = self._target_size
+    
+    def _guide_config(self):
+        """Return cached guide settings, refreshing only when the config changed"""
+        if self._cfg_ver != self.config.version:
+            get = self.config.get
+            self._cfg = (get('guide_enabled'), get('guide_x'), get('guide_y'),
+                         get('guide_width'), get('guide_height'))
+            self._cfg_ver = self.config.version
+        return self._cfg
     
     def on_draw(self, widget, cr):
         alloc = widget.get_allocation()
         width, height = alloc.width, alloc.height
         
         # Draw camera frame or captured photo
-        frame_to_draw = self.captured_frame if self.preview_mode else self.current_frame
+        frame_to_draw = self.preview_frame if self.preview_mode else self.current_frame
         
         if frame_to_draw is not None:
             h, w = frame_to_draw.shape[:2]
@@ -267,34 +467,40 @@ class CameraView(Gtk.Box):
             x_offset = (width - new_w) // 2
             y_offset = (height - new_h) // 2
             
-            # Cache pixbuf if size hasn't changed (optimization)
-            frame_size = (w, h, new_w, new_h)
-            if self.last_frame_size != frame_size or self.cached_pixbuf is None:
-                pixbuf = GdkPixbuf.Pixbuf.new_from_data(
-                    frame_to_draw.tobytes(),
-                    GdkPixbuf.Colorspace.RGB,
-                    False, 8, w, h, w * 3
-                )
-                self.cached_pixbuf = pixbuf.scale_simple(
-                    new_w, new_h, GdkPixbuf.InterpType.BILINEAR
-                )
-                self.last_frame_size = frame_size
-            
-            Gdk.cairo_set_source_pixbuf(cr, self.cached_pixbuf, x_offset, y_offset)
+            # Wrap the BGRA buffer directly (no copy) and let Cairo do the scaling.
+            # The live view is mirrored like a selfie camera (a negative x scale, at
+            # no extra cost); the captured photo is shown as it will be saved.
+            surface = cairo.ImageSurface.create_for_data(
+                memoryview(frame_to_draw), cairo.FORMAT_RGB24, w, h, w * 4
+            )
+            cr.save()
+            if self.preview_mode:
+                cr.translate(x_offset, y_offset)
+                cr.scale(scale, scale)
+            else:
+                cr.translate(x_offset + w * scale, y_offset)
+                cr.scale(-scale, scale)
+            cr.set_source_surface(surface, 0, 0)
+            cr.get_source().set_filter(cairo.FILTER_BILINEAR)
             cr.paint()
+            cr.restore()
             
             # Draw face guide overlay (only in live view, not in preview)
-            if self.config.get('guide_enabled') and not self.preview_mode:
-                guide_x = self.config.get('guide_x') * width
-                guide_y = self.config.get('guide_y') * height
-                guide_w = self.config.get('guide_width') * width
-                guide_h = self.config.get('guide_height') * height
-                
-                cr.save()
-                cr.translate(guide_x, guide_y)
-                cr.scale(guide_w / 2, guide_h / 2)
-                cr.arc(0, 0, 1, 0, 2 * 3.14159)
-                cr.restore()
+            enabled, gx, gy, gw, gh = self._guide_config()
+            if enabled and not self.preview_mode:
+                # Build the ellipse path only when the guide or widget size changes.
+                # guide_x is in image space, so mirror it to match the preview.
+                key = (self._cfg_ver, width, height)
+                if self._guide_path_key != key:
+                    cr.save()
+                    cr.translate((1 - gx) * width, gy * height)
+                    cr.scale(gw * width / 2, gh * height / 2)
+                    cr.arc(0, 0, 1, 0, 2 * 3.14159)
+                    cr.restore()
+                    self._guide_path = cr.copy_path()
+                    self._guide_path_key = key
+                else:
+                    cr.append_path(self._guide_path)
                 
                 cr.set_source_rgba(1, 1, 1, 0.5)
                 cr.set_line_width(2)
@@ -305,12 +511,13 @@ class CameraView(Gtk.Box):
         self.drawing_area.queue_draw()
     
     def on_button_press(self, widget, event):
-        if self.config.get('guide_enabled') and not self.preview_mode:
+        enabled, gx, gy, gw, gh = self._guide_config()
+        if enabled and not self.preview_mode:
             alloc = widget.get_allocation()
-            guide_x = self.config.get('guide_x') * alloc.width
-            guide_y = self.config.get('guide_y') * alloc.height
-            guide_w = self.config.get('guide_width') * alloc.width
-            guide_h = self.config.get('guide_height') * alloc.height
+            guide_x = (1 - gx) * alloc.width  # Mirrored, see on_draw
+            guide_y = gy * alloc.height
+            guide_w = gw * alloc.width
+            guide_h = gh * alloc.height
             
             # Check if click is near guide
             dx = (event.x - guide_x) / (guide_w / 2)
@@ -321,29 +528,41 @@ class CameraView(Gtk.Box):
     def on_motion(self, widget, event):
         if self.dragging:
             alloc = widget.get_allocation()
-            self.config.set('guide_x', event.x / alloc.width)
-            self.config.set('guide_y', event.y / alloc.height)
+            # Store guide_x in image space, undoing the preview mirror
+            self._pending_motion = (1 - event.x / alloc.width, event.y / alloc.height)
+            # Coalesce motion events to one update per display frame (~60Hz)
+            if self._motion_timer is None:
+                self._motion_timer = GLib.timeout_add(16, self._flush_motion)
+    
+    def _flush_motion(self):
+        self._motion_timer = None
+        if self._pending_motion is not None:
+            guide_x, guide_y = self._pending_motion
+            self._pending_motion = None
+            self.config.set('guide_x', guide_x)
+            self.config.set('guide_y', guide_y)
             self.drawing_area.queue_draw()
+        return False  # Don't repeat
     
     def on_button_release(self, widget, event):
         self.dragging = False
     
     def on_capture(self, button):
-        if self.current_frame is not None:
-            self.captured_frame = self.current_frame.copy()
+        frame = self.camera_thread.get_full_frame() if self.camera_thread else None
+        if frame is not None:
+            # The camera thread never reuses a frame buffer once published
+            self.captured_frame = frame
+            self.preview_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
             self.preview_mode = True
             self.capture_button.set_sensitive(False)
             self.save_button.set_sensitive(True)
             self.discard_button.set_sensitive(True)
             self.guide_toggle.set_sensitive(False)
-            self.cached_pixbuf = None  # Clear cache for preview
             self.drawing_area.queue_draw()
     
     def on_save(self, button):
         if self.captured_frame is not None:
-            # Convert back to BGR for saving
-            frame_bgr = cv2.cvtColor(self.captured_frame, cv2.COLOR_RGB2BGR)
-            self.on_photo_taken_callback(frame_bgr)
+            self.on_photo_taken_callback(self.captured_frame)
             self.reset_capture()
     
     def on_discard(self, button):
@@ -351,13 +570,15 @@ class CameraView(Gtk.Box):
     
     def reset_capture(self):
         self.captured_frame = None
+        self.preview_frame = None
         self.preview_mode = False
         self.capture_button.set_sensitive(True)
         self.save_button.set_sensitive(False)
         self.discard_button.set_sensitive(False)
         self.guide_toggle.set_sensitive(True)
-        self.cached_pixbuf = None  # Clear cache
         self.drawing_area.queue_draw()
+        # Pick up any frame that arrived while the preview was shown
+        self._on_frame_ready()
 
 class TimelapseView(Gtk.Box):
     """Timelapse creation view"""
@@ -410,15 +631,30 @@ class TimelapseView(Gtk.Box):
         self.progress.set_show_text(True)
         self.pack_start(self.progress, False, False, 0)
         
+        self._photos_cache = None  # (photos_dir, dir mtime, sorted names)
+        
         # Defer photo counting to avoid blocking UI on startup
         GLib.idle_add(self.update_photo_count)
     
+    def _scan(self, photos_dir):
+        """List photos in photos_dir sorted by filename, reusing the last scan if unchanged"""
+        mtime = os.stat(photos_dir).st_mtime_ns
+        cache = self._photos_cache
+        if cache and cache[0] == photos_dir and cache[1] == mtime:
+            return cache[2]
+        with os.scandir(photos_dir) as it:
+            photos = sorted(e.name for e in it
+                            if e.is_file() and os.path.splitext(e.name)[1].lower() in ('.jpg', '.png'))
+        self._photos_cache = (photos_dir, mtime, photos)
+        return photos
+    
+    def invalidate_photos(self):
+        self._photos_cache = None
+    
     def update_photo_count(self):
-        photos_dir = self.config.get('photos_directory')
+        photos_dir = self.config.photos_directory
         if os.path.exists(photos_dir):
-            photos = [f for f in os.listdir(photos_dir) 
-                     if f.endswith(('.jpg', '.png'))]
-            count = len(photos)
+            count = len(self._scan(photos_dir))
             self.count_label.set_text(f"Found {count} photo(s) in directory")
             self.create_button.set_sensitive(count > 0)
         else:
@@ -427,12 +663,11 @@ class TimelapseView(Gtk.Box):
         return False  # Don't repeat
     
     def on_create(self, button):
-        photos_dir = self.config.get('photos_directory')
+        photos_dir = self.config.photos_directory
         duration = self.duration_adj.get_value()
         
         # Get all photos sorted by filename (date)
-        photos = sorted([f for f in os.listdir(photos_dir) 
-                        if f.endswith(('.jpg', '.png'))])
+        photos = self._scan(photos_dir) if os.path.exists(photos_dir) else []
         
         if len(photos) == 0:
             self.status_label.set_text("No photos found!")
@@ -457,44 +692,67 @@ class TimelapseView(Gtk.Box):
             output_file = os.path.join(photos_dir, 
                                       f"timelapse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4")
             
-            # Create temporary file list for ffmpeg
-            list_file = os.path.join(photos_dir, 'filelist.txt')
-            with open(list_file, 'w') as f:
-                for photo in photos:
-                    # Escape single quotes in filenames for concat demuxer
-                    escaped = photo.replace("'", "'\\''")
-                    f.write(f"file '{escaped}'\n")
-                    f.write(f"duration {duration}\n")
-                # Add last image again (ffmpeg concat quirk)
-                if photos:
-                    escaped = photos[-1].replace("'", "'\\''")
-                    f.write(f"file '{escaped}'\n")
+            # Decode photos here and stream raw frames to ffmpeg, letterboxing every
+            # frame to the first readable photo's size (even dimensions for yuv420p)
+            paths = [os.path.join(photos_dir, photo) for photo in photos]
+            first = None
+            for path in paths:
+                first = cv2.imread(path)
+                if first is not None:
+                    break
+            if first is None:
+                raise ValueError("Could not read any photos")
+            height, width = first.shape[:2]
+            size = (width - width % 2, height - height % 2)
             
             # Run ffmpeg
             ffmpeg_cmd = 'ffmpeg.exe' if SYSTEM == 'Windows' else 'ffmpeg'
             
+            # Probe once per run; hardware encoders are far faster than libx264
+            if self.config.encoder is None:
+                self.config.encoder = detect_h264_encoder(ffmpeg_cmd)
+            pre_input, encoder_args = H264_ENCODERS[self.config.encoder]
+            
             cmd = [
                 ffmpeg_cmd, '-y',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', list_file,
-                '-vsync', 'vfr',
-                '-pix_fmt', 'yuv420p',
-                '-c:v', 'libx264',  # Explicitly specify codec
-                '-preset', 'medium',  # Balance quality/speed
+                *pre_input,
+                '-f', 'rawvideo',
+                '-pix_fmt', 'bgr24',
+                '-s', f'{size[0]}x{size[1]}',
+                '-r', str(fps),
+                '-i', 'pipe:0',
+                *encoder_args,
                 output_file
             ]
             
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, 
-                                      stderr=subprocess.PIPE,
-                                      cwd=photos_dir)  # Set working directory
-            stdout, stderr = process.communicate()
-            
-            # Clean up
-            try:
-                os.remove(list_file)
-            except:
-                pass
+            # Log to a temp file: a full stderr pipe would stall ffmpeg while we write
+            with tempfile.TemporaryFile() as errlog:
+                process = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                          stdout=subprocess.DEVNULL,
+                                          stderr=errlog)
+                try:
+                    for path, frame in zip(paths, load_frames(paths, size)):
+                        if frame is None:
+                            debug_print(f"Skipping unreadable photo: {path}")
+                            continue
+                        process.stdin.write(frame.tobytes())
+                except OSError as e:
+                    # ffmpeg exited early and the error is in its log; Windows
+                    # reports a closed pipe as EINVAL rather than EPIPE
+                    if e.errno not in (errno.EPIPE, errno.EINVAL):
+                        process.kill()
+                        raise
+                except BaseException:
+                    process.kill()
+                    raise
+                finally:
+                    try:
+                        process.stdin.close()
+                    except OSError:
+                        pass
+                    process.wait()
+                errlog.seek(0)
+                stderr = errlog.read()
             
             if process.returncode == 0:
                 GLib.idle_add(self.on_timelapse_complete, output_file)
@@ -528,10 +786,16 @@ class MainWindow(Gtk.Window):
         self.config = Config()
         
         # Create photos directory if it doesn't exist
-        photos_dir = self.config.get('photos_directory')
+        photos_dir = self.config.photos_directory
         debug_print(f"Photos directory: {photos_dir}")
         os.makedirs(photos_dir, exist_ok=True)
         
+        # Single background worker for disk I/O (photo saves). Unbounded so
+        # put() never blocks the GTK main loop
+        self._io_q = queue.Queue()
+        self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+        self._io_thread.start()
+        
         debug_print("Creating main UI")
         # Main container
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -565,7 +829,7 @@ class MainWindow(Gtk.Window):
     
     def check_today_photo(self):
         today = datetime.now().strftime('%Y-%m-%d')
-        photos_dir = self.config.get('photos_directory')
+        photos_dir = self.config.photos_directory
         
         if os.path.exists(photos_dir):
             existing = [f for f in os.listdir(photos_dir) if f.startswith(today)]
@@ -584,20 +848,31 @@ class MainWindow(Gtk.Window):
                 dialog.destroy()
         return False  # Don't repeat
     
+    def _io_loop(self):
+        """Run queued (fn, args) jobs in order until a None sentinel arrives"""
+        while True:
+            job = self._io_q.get()
+            if job is None:
+                break
+            fn, args = job
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Error in I/O worker: {e}")
+    
     def on_photo_taken(self, frame):
-        """Handle photo taken - run in thread to avoid UI blocking"""
+        """Handle photo taken - save on the I/O worker to avoid UI blocking"""
         def save_photo():
             today = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            photos_dir = self.config.get('photos_directory')
+            photos_dir = self.config.photos_directory
             filename = os.path.join(photos_dir, f"{today}.jpg")
             
-            cv2.imwrite(filename, frame)
+            # Quality 90 baseline JPEG: noticeably smaller and faster than the default 95
+            cv2.imwrite(filename, frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
             
             GLib.idle_add(self.show_photo_saved_dialog, filename)
         
-        thread = threading.Thread(target=save_photo)
-        thread.daemon = True
-        thread.start()
+        self._io_q.put((save_photo, ()))
     
     def show_photo_saved_dialog(self, filename):
         dialog = Gtk.MessageDialog(
@@ -612,6 +887,7 @@ class MainWindow(Gtk.Window):
         dialog.destroy()
         
         # Update timelapse view
+        self.timelapse_view.invalidate_photos()
         self.timelapse_view.update_photo_count()
         return False
     
@@ -626,7 +902,7 @@ class MainWindow(Gtk.Window):
             Gtk.STOCK_OPEN, Gtk.ResponseType.OK
         )
         
-        dialog.set_current_folder(self.config.get('photos_directory'))
+        dialog.set_current_folder(self.config.photos_directory)
         
         response = dialog.run()
         if response == Gtk.ResponseType.OK:
@@ -640,6 +916,9 @@ class MainWindow(Gtk.Window):
     def on_destroy(self, widget):
         debug_print("Window closing, stopping camera")
         self.camera_view.stop_camera()
+        debug_print("Waiting for pending saves")
+        self._io_q.put(None)
+        self._io_thread.join(timeout=2)
         debug_print("Exiting GTK main loop")
         Gtk.main_quit()
 
@@ -675,11 +954,6 @@ def main():
         else:
             print("  Linux: sudo apt install ffmpeg (Debian/Ubuntu)")
     
-    # Camera backend optimization for Windows
-    if SYSTEM == 'Windows':
-        os.environ['OPENCV_VIDEOIO_PRIORITY_MSMF'] = '0'
-        debug_print("Set Windows camera backend preference")
-    
     debug_print("Creating main window...")
     win = MainWindow()
     debug_print("Showing window...")